@@ -0,0 +1,37 @@
+import sys
+import time
+
+from jpi import Interpreter
+
+# Generate a large program exercising every parser construct
+def generate(blocks):
+    lines = []
+    for b in range(blocks):
+        lines += ["n{b} : 10\n".format(b = b),
+                  "i{b} : 0\n".format(b = b),
+                  "x{b} : [n{b} - i{b} : (@r\n".format(b = b),
+                  "            'r' : ? i{b} - 3 : (i{b} + 1) ? i{b} - 1 : 2 ; 3\n".format(b = b),
+                  "            'c' : 0\n",
+                  "            's' : [2 - 'c' : (@t\n",
+                  "                              't' : 'c' + 1 - (2 - 'r')\n",
+                  "                              'c' : 'c' + 1\n",
+                  "                             )\n",
+                  "                  ]\n",
+                  "            i{b} : i{b} + 1\n".format(b = b),
+                  "          )\n",
+                  "     ]\n"]
+    return lines
+
+# Measure parser throughput in lines/sec
+if __name__ == "__main__":
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    lines  = generate(blocks)
+
+    i = Interpreter([])
+    start = time.perf_counter()
+    for line in lines:
+        i.feed(line)
+    elapsed = time.perf_counter() - start
+
+    print("Parsed {} lines ({} nodes) in {:.3f}s: {:.0f} lines/sec".format(
+        len(lines), len(i.program.nodes), elapsed, len(lines) / elapsed))
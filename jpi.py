@@ -1,4 +1,15 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
 import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from enum import Enum
 
 
@@ -6,6 +17,12 @@ def terminate():
     print("Interpreter Terminated")
     sys.exit(1)
 
+# Convert a runtime value to a hashable equivalent (cycle lists become tuples)
+def freeze(val):
+    if isinstance(val, list):
+        return tuple(freeze(v) for v in val)
+    return val
+
 class NodeType(Enum):
     SEQ       = 10   # Sequence of statements
     SCOPE     = 11   # Scope for local variables
@@ -21,6 +38,20 @@ class NodeType(Enum):
     PREDICATE = 99   # Predicate
     EXPR      = 100  # An expression (potentially containing arith.)
 
+# Node type sets used by the parser
+SEQUENCES  = frozenset({NodeType.SEQ})
+PREDICATED = frozenset({NodeType.CYCLE, NodeType.CONDEX})  # Constructs with predicates
+BRANCHES   = frozenset({NodeType.IF, NodeType.ELSE})
+CLOSEABLE  = frozenset({NodeType.EXPR, NodeType.SCOPE})    # Constructs closed by ')'
+
+# Predicate tests: an IF is taken while its predicate is positive,
+# a CYCLE ends once its predicate is not
+def if_test(ev):
+    return ev > 0
+
+def cycle_test(ev):
+    return ev <= 0
+
 class Node:
     def __init__(self, lptr, i, parent, nt, scope_sig, val = None):
         self.lptr     = lptr          # Line Pointer
@@ -70,6 +101,7 @@ class Program:
         self.cons_stack    = [0] # Constructs: Code structures using (), []
         self.active_stack  = [0] # Actives:    Nodes with ability to have children
         self.scope_stack   = [0] # Scopes:     Structures with own locals
+        self.sig_stack     = ["0"] # Scope Signatures, kept in step with scope_stack
 
     def set_lptr(self, lptr):
         self.cur_lptr = lptr
@@ -92,60 +124,104 @@ class Program:
 
     # Add leaf node to current Active
     def add_leaf(self, nt, val = None):
-        scope_sig = ".".join(str(s) for s in self.scope_stack)
-        n = Node(self.cur_lptr, len(self.nodes), self.active_stack[-1], nt, scope_sig, val)
-        self.active().add_child(len(self.nodes))
-        self.nodes.append(n)
+        i = len(self.nodes)
+        parent = self.active_stack[-1]
+        self.nodes[parent].children.append(i)
+        self.nodes.append(Node(self.cur_lptr, i, parent, nt, self.sig_stack[-1], val))
 
     # Create Active child on current Active
     def add_active(self, nt, val = None, construct = False):
+        i = len(self.nodes)
         if nt == NodeType.SCOPE:
-            self.scope_stack.append(len(self.nodes))
+            self.scope_stack.append(i)
+            self.sig_stack.append("{}.{}".format(self.sig_stack[-1], i))
 
-        scope_sig = ".".join(str(s) for s in self.scope_stack)
-
-        n = Node(self.cur_lptr, len(self.nodes), self.active_stack[-1], nt, scope_sig, val)
-        self.active().add_child(len(self.nodes))
-        self.nodes.append(n)
-        self.active_stack.append(n.i)
+        parent = self.active_stack[-1]
+        self.nodes[parent].children.append(i)
+        self.nodes.append(Node(self.cur_lptr, i, parent, nt, self.sig_stack[-1], val))
+        self.active_stack.append(i)
 
         if construct:
-            self.cons_stack.append(n.i)
+            self.cons_stack.append(i)
 
     # Shift back up the stack by 1 active
     def conclude_active(self):
         val = self.active_stack.pop()
         if val == self.scope_stack[-1]:
             self.scope_stack.pop()
+            self.sig_stack.pop()
         if val == self.cons_stack[-1]:
             self.cons_stack.pop()
         return val
 
-    # Shift up the stack until reaching an active satisfying a condition
-    def rebase_when(self, checkf):
-        while not checkf(self.node(self.active_stack[-1])):
+    # Shift up the stack until reaching an active with a node type in `nts`
+    def rebase_to(self, nts):
+        while self.nodes[self.active_stack[-1]].nt not in nts:
             self.conclude_active()
 
-    # Shift up the stack, with the last shifted active satsifying a condition
-    def conclude_when(self, checkf):
-        self.rebase_when(checkf)
-        self.conclude_active()
-
     # Conclude the current construct
+    # Constructs are also actives, so the current construct is the topmost one on the active stack
     def conclude_construct(self):
-        self.conclude_when(lambda node: node.i == self.cons_stack[-1])
+        cons = self.cons_stack[-1]
+        while self.conclude_active() != cons:
+            pass
 
     # Rebase the current construct (make it the active)
     def rebase_construct(self):
-        self.rebase_when(lambda node: node.i == self.cons_stack[-1])
+        cons = self.cons_stack[-1]
+        while self.active_stack[-1] != cons:
+            self.conclude_active()
 
     # Rebase the current sequence (make it the active)
     def rebase_sequence(self):
-        self.rebase_when(lambda node: node.nt == NodeType.SEQ)
+        self.rebase_to(SEQUENCES)
 
     # Rebase to a grouping when at a linebreak (to the first construct or sequence)
     def rebase_lineend(self):
-        self.rebase_when(lambda node: node.nt == NodeType.SEQ or node.i == self.cons_stack[-1])
+        cons = self.cons_stack[-1]
+        while self.active_stack[-1] != cons and self.nodes[self.active_stack[-1]].nt != NodeType.SEQ:
+            self.conclude_active()
+
+    # Find SCOPEs whose result depends only on the names they read
+    # A scope is pure if it never assigns '!' or a GNAME, and each local it
+    # assigns is assigned nowhere outside of it (so it is created and
+    # destroyed by the scope itself)
+    # Yields a mapping: Scope Index -> (Names read from outside the scope)
+    def pure_scopes(self):
+        # Mapping: Variable Name -> {Indexes of LVALUE nodes assigning it}
+        writers = {}
+        for n in self.nodes:
+            if n.nt == NodeType.LVALUE:
+                writers.setdefault(n.val.val, set()).add(n.i)
+
+        pure = {}
+        for scope in self.nodes:
+            if scope.nt != NodeType.SCOPE:
+                continue
+
+            subtree = scope.rec_list(self)
+            inside  = {n.i for n in subtree}
+
+            written = set()
+            read    = set()
+            is_pure = True
+            for n in subtree:
+                if n.nt == NodeType.LVALUE:
+                    if n.val.tt != TokenType.LNAME or not writers[n.val.val] <= inside:
+                        is_pure = False
+                        break
+                    written.add(n.val.val)
+
+                elif n.nt == NodeType.VALUE and n.val.tt != TokenType.NUMBER:
+                    read.add(n.val.val)
+
+                elif n.nt == NodeType.RETURN:
+                    read.add(n.val.val)
+
+            if is_pure:
+                pure[scope.i] = tuple(sorted(read - written))
+
+        return pure
 
     def __repr__(self):
         return self.root().rec_repr(self, 0).strip()
@@ -166,6 +242,18 @@ class TokenType(Enum):
     SEMI   = 41   # ;
 
 
+# Mapping for single char tokens
+TOKMAP = {'[' : TokenType.LBRACK,
+          ']' : TokenType.RBRACK,
+          '(' : TokenType.LPAREN,
+          ')' : TokenType.RPAREN,
+          '@' : TokenType.AT    ,
+          '+' : TokenType.PLUS  ,
+          '-' : TokenType.MINUS ,
+          ':' : TokenType.COLON ,
+          '?' : TokenType.QUOI  ,
+          ';' : TokenType.SEMI  ,}
+
 class Token:
     def __init__(self, tt, val, lptr):
         self.tt   = tt    # Token Type
@@ -181,6 +269,14 @@ class Interpreter:
         self.args    = args       # A cleaned up list of program arguments
         self.lines   = []         # Raw Program Lines
         self.program = Program()  # Program object
+        self.memo    = OrderedDict()  # Memo Table: (Scope Index, Read Values) -> Scope Value
+        self.stats   = {"steps"       : 0,
+                        "memo hits"   : 0,
+                        "memo misses" : 0}
+
+    # Get the value of an option passed as --name=value
+    def _opt(self, name, default):
+        return get_opt(self.args, name, default)
 
     # Log an Error
     def _err(self, lptr, message):
@@ -201,20 +297,21 @@ class Interpreter:
         else:
             print("=-=-=-=-=-=-=-=-=-=")
 
+    # Log execution statistics
+    def _stats(self):
+        self._rule()
+        for stat in self.stats:
+            print("{} : {}".format(stat, self.stats[stat]))
+        self._rule()
+
+    # Abort execution on reaching a limit, logging the stats gathered so far
+    def _limit(self, lptr, message):
+        self._err(lptr, message)
+        self._stats()
+        terminate()
+
     # Tokenise a line of the program
     def tokenise(self, lptr):
-        # Mapping for single char tokens
-        tokmap = {'[' : TokenType.LBRACK,
-                  ']' : TokenType.RBRACK,
-                  '(' : TokenType.LPAREN,
-                  ')' : TokenType.RPAREN,
-                  '@' : TokenType.AT    ,
-                  '+' : TokenType.PLUS  ,
-                  '-' : TokenType.MINUS ,
-                  ':' : TokenType.COLON ,
-                  '?' : TokenType.QUOI  ,
-                  ';' : TokenType.SEMI  ,}
-
         line = self.lines[lptr]
         toks = []
 
@@ -273,8 +370,8 @@ class Interpreter:
                     continue
 
                 # Deal with single char tokens
-                if c in tokmap.keys():
-                    toks.append(Token(tokmap[c], None, lptr))
+                if c in TOKMAP:
+                    toks.append(Token(TOKMAP[c], None, lptr))
                     continue
 
                 # Begin to build Global Names.
@@ -302,209 +399,24 @@ class Interpreter:
                 self._err(lptr, "Bad character in program '{}'".format(c))
         return toks
 
+    # Parse a line of tokens into the program
+    # Each token is handled by looking up PARSE_TABLE[expect, token type]
+    # Handlers return the next expectation, or HALT + expectation to stop parsing the line
     def parse(self, lptr, toks):
         prog = self.program
         prog.set_lptr(lptr)
 
-        # Parser Expectation States
-        initial        = 10    # Expect the start of a line
-        assign         = 11    # Expect an assignment colon
-        paren_contents = 20    # Expect contents of ()
-        scope_ret      = 21    # Expect a scope return to follow @
-        expr_val       = 100   # Expect a value in an expression
-        expr_op        = 101   # Expect an operation in an expression
-        end            = 900   # Expect newline
-
-        expect  = initial
+        table  = PARSE_TABLE
+        expect = INITIAL
 
         # Iterate through tokens
-
-        index = -1
-        while (index + 1) < len(toks):
-            index += 1
-            tok = toks[index]
-
-            if   expect == initial:
-                # A line can start with a name in the case of an assignment
-                if tok.tt in {TokenType.GNAME, TokenType.LNAME}:
-                    prog.add_active(NodeType.ASSIGN)
-                    prog.add_leaf(NodeType.LVALUE, val = tok)
-                    expect = assign
-                    continue
-
-                # It may also start with ')' or ']' - but we want this to be handled by expr
-                # Fallthrough to `expect == expr`
-                if tok.tt in {TokenType.RPAREN, TokenType.RBRACK}:
-                    expect = expr_op
-                else:
-                    self._err(lptr, "Malformed line")
-                    terminate()
-
-            if expect == assign:
-                # Only a COLON can be `assign` (succeed an LVALUE)
-                if tok.tt == TokenType.COLON:
-                    prog.add_active(NodeType.EXPR)
-                    expect = expr_val
-                    continue
-
-                else:
-                    self._err(lptr, "Expected assignment")
-                    terminate()
-
-            if expect == expr_val:
-                # Handle start of condexes
-                if tok.tt == TokenType.QUOI:
-                    prog.add_active(NodeType.CONDEX, construct = True)
-                    prog.add_active(NodeType.IF    )
-                    prog.add_active(NodeType.PREDICATE,
-                                    val = (lambda ev: ev > 0 ,
-                                           prog.construct().i,
-                                           prog.active().i))
-                    prog.add_active(NodeType.EXPR)
-                    continue
-
-                # Handle Values
-                if tok.tt in {TokenType.GNAME,
-                              TokenType.LNAME,
-                              TokenType.NUMBER}:
-
-                    # ! manifests as a GNAME but can only be used as an LVALUE
-                    if tok.val == "!":
-                        self._err(lptr, "Cannot use output variable '!' as value.")
-                        break
-
-                    # Special cases aside we can just add as a leaf
-                    prog.add_leaf(NodeType.VALUE, val = tok)
-                    expect = expr_op
-                    continue
-
-                if tok.tt == TokenType.LPAREN:
-                    expect = paren_contents
-                    continue
-
-                if tok.tt == TokenType.LBRACK:
-                    prog.add_active(NodeType.CYCLE, construct = True)
-                    prog.add_active(NodeType.PREDICATE,
-                                    val = (lambda ev: ev <= 0, prog.construct().i))
-                    prog.add_active(NodeType.EXPR)
-                    continue
-
-
-            if expect == expr_op:
-                # Handle Operators
-                # Note that arithmatic parsing is handled during execution
-                if tok.tt in {TokenType.PLUS, TokenType.MINUS}:
-                    prog.add_leaf(NodeType.OP, val = tok)
-                    expect = expr_val
-                    continue
-
-                # Brackets and Parens need to be handled - they cause `expect` changes
-                implied_colon = False
-                if tok.tt in {TokenType.LPAREN, TokenType.LBRACK}:
-                    if prog.construct().nt in {NodeType.CYCLE, NodeType.CONDEX}:
-                        self._warn(lptr, "Missing colon in construct")
-                        index -= 1
-                        implied_colon = True
-                        expect = expr_val
-                    else:
-                        self._err(lptr, "Malformed Expression - Found '(' or '[' in bad position.")
-                        terminate()
-
-                if tok.tt == TokenType.RPAREN:
-                    while prog.construct().nt == NodeType.CONDEX:
-                        prog.conclude_construct()
-
-                    if prog.construct().nt not in {NodeType.EXPR, NodeType.SCOPE}:
-                        self._err(lptr, "Found ')' but next construct to close is not an expression or scope.")
-                        terminate()
-
-                    prog.conclude_construct()
-                    continue
-
-
-                if tok.tt == TokenType.RBRACK:
-                    while prog.construct().nt == NodeType.CONDEX:
-                        prog.conclude_construct()
-
-                    if prog.construct().nt != NodeType.CYCLE:
-                        self._err(lptr, "Found ']' but next construct to close is not a cycle.")
-                        terminate()
-
-                    prog.conclude_construct()
-                    continue
-
-                # Only allow a colon if we're at the top level of a CYCLE
-                if tok.tt == TokenType.COLON or implied_colon:
-                    if prog.construct().nt in {NodeType.CYCLE, NodeType.CONDEX}:
-                        if prog.construct().nt == NodeType.CONDEX:
-                            prog.rebase_when(lambda n: n.nt in {NodeType.IF, NodeType.ELSE})
-                            if prog.active().nt == NodeType.ELSE:
-                                self._err(lptr, "Cannot have predicate in else statement")
-                                terminate()
-                        else:
-                            prog.rebase_construct()
-                        prog.add_active(NodeType.EXPR)
-                        expect = expr_val
-                        continue
-                    else:
-                        self._err(lptr, "Colon found outside of cycle or conditional expression")
-                        break
-
-                if tok.tt == TokenType.QUOI:
-                    if prog.construct().nt == NodeType.CONDEX:
-                        prog.rebase_construct()
-                        prog.add_active(NodeType.IF)
-                        prog.add_active(NodeType.PREDICATE,
-                                        val = (lambda ev: ev > 0 ,
-                                               prog.construct().i,
-                                               prog.active().i))
-                        prog.add_active(NodeType.EXPR)
-                        expect = expr_val
-                        continue
-
-                if tok.tt == TokenType.SEMI:
-                    if prog.construct().nt == NodeType.CONDEX:
-                        prog.rebase_construct()
-                        prog.add_active(NodeType.ELSE)
-                        prog.add_active(NodeType.EXPR)
-                        expect = expr_val
-                        continue
-
-            if expect == paren_contents:
-                # An '@' implies a scope
-                if tok.tt == TokenType.AT:
-                    prog.add_active(NodeType.SCOPE, construct = True)
-                    expect = scope_ret
-                    continue
-
-                # Otherwise, just a normal expression
-                # We decrement the index to allow `expect = expr_val` to handle it
-                else:
-                    prog.add_active(NodeType.EXPR, construct = True)
-                    expect = expr_val
-                    index -= 1
-                    continue
-
-            # The scope return value manifests as a GNAME
-            # This is because quotes are elided
-            # It's still semantically an LNAME
-            if expect == scope_ret:
-                if tok.tt == TokenType.GNAME:
-                    prog.add_active(NodeType.RETURN, val = tok)
-                    prog.add_active(NodeType.SEQ)
-                    expect = end
-                    continue
-
-            # If the line has ended, the loop should already have broken!
-            if expect == end:
-                self._err(lptr, "Tokens found beyond expected EOL")
+        for tok in toks:
+            expect = table[expect, tok.tt](self, prog, lptr, tok)
+            if expect >= HALT:
+                expect -= HALT
                 break
 
-            # This should never happen!
-            self._err(lptr, "Internal Parser Error: Uncovered expectation")
-            terminate()
-
-        if expect not in {initial, end, expr_op}:
+        if expect not in {INITIAL, END, EXPR_OP}:
             self._warn(lptr, "weird expect at nl {}".format(expect))
 
         # Return to the nearest sequence or construct - concluding assignments etc.
@@ -515,6 +427,165 @@ class Interpreter:
                 break
             prog.conclude_active()
 
+    # Parser handlers - see PARSE_TABLE for the expectations and tokens they handle
+
+    # A line can start with a name in the case of an assignment
+    def _p_lvalue(self, prog, lptr, tok):
+        prog.add_active(NodeType.ASSIGN)
+        prog.add_leaf(NodeType.LVALUE, val = tok)
+        return ASSIGN
+
+    def _p_malformed_line(self, prog, lptr, tok):
+        self._err(lptr, "Malformed line")
+        terminate()
+
+    # Only a COLON can be `assign` (succeed an LVALUE)
+    def _p_assign(self, prog, lptr, tok):
+        prog.add_active(NodeType.EXPR)
+        return EXPR_VAL
+
+    def _p_expected_assign(self, prog, lptr, tok):
+        self._err(lptr, "Expected assignment")
+        terminate()
+
+    # Handle start of condexes
+    def _p_condex(self, prog, lptr, tok):
+        prog.add_active(NodeType.CONDEX, construct = True)
+        prog.add_active(NodeType.IF    )
+        prog.add_active(NodeType.PREDICATE,
+                        val = (if_test,
+                               prog.cons_stack[-1],
+                               prog.active_stack[-1]))
+        prog.add_active(NodeType.EXPR)
+        return EXPR_VAL
+
+    # Handle Values
+    def _p_value(self, prog, lptr, tok):
+        # ! manifests as a GNAME but can only be used as an LVALUE
+        if tok.val == "!":
+            self._err(lptr, "Cannot use output variable '!' as value.")
+            return HALT + EXPR_VAL
+
+        # Special cases aside we can just add as a leaf
+        prog.add_leaf(NodeType.VALUE, val = tok)
+        return EXPR_OP
+
+    def _p_lparen(self, prog, lptr, tok):
+        return PAREN_CONTENTS
+
+    def _p_cycle(self, prog, lptr, tok):
+        prog.add_active(NodeType.CYCLE, construct = True)
+        prog.add_active(NodeType.PREDICATE,
+                        val = (cycle_test, prog.cons_stack[-1]))
+        prog.add_active(NodeType.EXPR)
+        return EXPR_VAL
+
+    # Handle Operators
+    # Note that arithmatic parsing is handled during execution
+    def _p_op(self, prog, lptr, tok):
+        prog.add_leaf(NodeType.OP, val = tok)
+        return EXPR_VAL
+
+    # A '(' or '[' after a cycle or condex predicate implies the missing colon
+    # The token is then handled as the start of the new expression
+    def _p_implied_colon(self, prog, lptr, tok):
+        if prog.construct().nt in PREDICATED:
+            self._warn(lptr, "Missing colon in construct")
+            self._p_colon(prog, lptr, tok)
+            return PARSE_TABLE[EXPR_VAL, tok.tt](self, prog, lptr, tok)
+
+        self._err(lptr, "Malformed Expression - Found '(' or '[' in bad position.")
+        terminate()
+
+    def _p_rparen(self, prog, lptr, tok):
+        while prog.construct().nt == NodeType.CONDEX:
+            prog.conclude_construct()
+
+        if prog.construct().nt not in CLOSEABLE:
+            self._err(lptr, "Found ')' but next construct to close is not an expression or scope.")
+            terminate()
+
+        prog.conclude_construct()
+        return EXPR_OP
+
+    def _p_rbrack(self, prog, lptr, tok):
+        while prog.construct().nt == NodeType.CONDEX:
+            prog.conclude_construct()
+
+        if prog.construct().nt != NodeType.CYCLE:
+            self._err(lptr, "Found ']' but next construct to close is not a cycle.")
+            terminate()
+
+        prog.conclude_construct()
+        return EXPR_OP
+
+    # Only allow a colon if we're at the top level of a CYCLE
+    def _p_colon(self, prog, lptr, tok):
+        cons = prog.construct().nt
+        if cons in PREDICATED:
+            if cons == NodeType.CONDEX:
+                prog.rebase_to(BRANCHES)
+                if prog.active().nt == NodeType.ELSE:
+                    self._err(lptr, "Cannot have predicate in else statement")
+                    terminate()
+            else:
+                prog.rebase_construct()
+            prog.add_active(NodeType.EXPR)
+            return EXPR_VAL
+
+        self._err(lptr, "Colon found outside of cycle or conditional expression")
+        return HALT + EXPR_OP
+
+    def _p_elif(self, prog, lptr, tok):
+        if prog.construct().nt != NodeType.CONDEX:
+            return self._p_uncovered(prog, lptr, tok)
+
+        prog.rebase_construct()
+        prog.add_active(NodeType.IF)
+        prog.add_active(NodeType.PREDICATE,
+                        val = (if_test,
+                               prog.cons_stack[-1],
+                               prog.active_stack[-1]))
+        prog.add_active(NodeType.EXPR)
+        return EXPR_VAL
+
+    def _p_else(self, prog, lptr, tok):
+        if prog.construct().nt != NodeType.CONDEX:
+            return self._p_uncovered(prog, lptr, tok)
+
+        prog.rebase_construct()
+        prog.add_active(NodeType.ELSE)
+        prog.add_active(NodeType.EXPR)
+        return EXPR_VAL
+
+    # An '@' implies a scope
+    def _p_scope(self, prog, lptr, tok):
+        prog.add_active(NodeType.SCOPE, construct = True)
+        return SCOPE_RET
+
+    # Otherwise, just a normal expression, and the token is handled as its start
+    def _p_paren_expr(self, prog, lptr, tok):
+        prog.add_active(NodeType.EXPR, construct = True)
+        return PARSE_TABLE[EXPR_VAL, tok.tt](self, prog, lptr, tok)
+
+    # The scope return value manifests as a GNAME
+    # This is because quotes are elided
+    # It's still semantically an LNAME
+    def _p_scope_ret(self, prog, lptr, tok):
+        prog.add_active(NodeType.RETURN, val = tok)
+        prog.add_active(NodeType.SEQ)
+        return END
+
+    # If the line has ended, the loop should already have broken!
+    def _p_beyond_eol(self, prog, lptr, tok):
+        self._err(lptr, "Tokens found beyond expected EOL")
+        return HALT + END
+
+    # This should never happen!
+    def _p_uncovered(self, prog, lptr, tok):
+        self._err(lptr, "Internal Parser Error: Uncovered expectation")
+        terminate()
+
     # Lines are fed in one at a time, and are tokenised and parsed
     def feed(self, line):
         self.lines.append(line)
@@ -524,26 +595,225 @@ class Interpreter:
 
     # Execute the entire program
     def execute(self):
-        nget = self.program.node
+        ex = Execution(self)
+        ex.run()
+        return ex.finish()
+
+    # Parse the program stored in a checkpoint and return its Execution, ready to continue
+    # Options given now override those stored in the checkpoint
+    def resume(self, path):
+        try:
+            with open(path) as f:
+                state = json.load(f)
+
+            if state["version"] != CHECKPOINT_VERSION:
+                print("Error: {} is not a compatible checkpoint\n".format(path))
+                terminate()
+
+            given = {a.partition("=")[0] for a in self.args}
+            self.args = [a for a in state["args"] if a.partition("=")[0] not in given] + self.args
+
+            # The program was already parsed (and any warnings shown) before suspending
+            with contextlib.redirect_stdout(io.StringIO()):
+                for line in state["lines"]:
+                    self.feed(line)
+
+            ex = Execution(self)
+            ex.restore(state)
+
+        except (OSError, ValueError, KeyError, TypeError, IndexError, AttributeError) as e:
+            print("Error: could not resume from {}: {}\n".format(path, e))
+            terminate()
+
+        return ex
+
+# Checkpoints are JSON objects; bump this when their layout changes
+CHECKPOINT_VERSION = 2
+
+# Options that control checkpointing itself, rather than the program, are not stored
+CHECKPOINT_OPTIONS = {"slice", "checkpoint", "resume"}
+
+# Execution holds the state of a running program so it can be run in slices,
+# checkpointed, and resumed later (possibly in another process)
+class Execution:
+    def __init__(self, interp):
+        self.interp = interp
+        prog = interp.program
+        nget = prog.node
 
         # Mapping: Scope Signature -> [Local Variables]
-        scope_map = {"0": []}
+        self.scope_map = {"0": []}
 
         # Nodes hold values that can propogate upwards
-        node_values = {}
+        self.node_values = {}
 
         # Variable values - both global and local
-        var_values  = {}
+        self.var_values  = {}
 
         # Recursively generate a list of nodes to be executed
-        to_exec = i.program.root().rec_list(i.program)
+        self.to_exec = prog.root().rec_list(prog)
 
         # Set this to a node index to act as a goto
-        jump_node = None
-
-        # Continue executing nodes while any are left
-        while to_exec:
+        self.jump_node = None
+
+        # Pure scopes are memoised on the values of the names they read
+        # Mapping: First Node Index -> [(Scope, Subtree Length, Read Names)], outermost first
+        self.memo_size   = int(interp._opt("memo-size", 256))
+        self.memo_starts = {}
+        if self.memo_size > 0:
+            for scope_i, read in prog.pure_scopes().items():
+                subtree = nget(scope_i).rec_list(prog)
+                self.memo_starts.setdefault(subtree[0].i, []).append((nget(scope_i), len(subtree), read))
+            for entries in self.memo_starts.values():
+                entries.sort(key = lambda e: -e[1])
+
+        # Mapping: Scope Index -> Memo Key, for pure scopes currently executing
+        self.memo_pending = {}
+
+        # Wall clock seconds spent in `run` so far
+        self.elapsed = 0.0
+
+        # Bytes held by program values when last measured, and since made by arithmatic
+        self.held      = 0
+        self.allocated = 0
+
+    # Has the program run to completion
+    def done(self):
+        return not self.to_exec
+
+    # Write the program and execution state to a checkpoint file
+    # The file is replaced atomically so a preempted write never leaves a broken checkpoint
+    # JSON has no int keys or tuples: node indexes become strings and memo keys become lists
+    def save(self, path):
+        interp = self.interp
+        state = {"version"      : CHECKPOINT_VERSION,
+                 "args"         : [a for a in interp.args if a.partition("=")[0] not in CHECKPOINT_OPTIONS],
+                 "lines"        : interp.lines,
+                 "to_exec"      : [n.i for n in self.to_exec],
+                 "node_values"  : self.node_values,
+                 "var_values"   : self.var_values,
+                 "scope_map"    : self.scope_map,
+                 "jump_node"    : self.jump_node,
+                 "memo_pending" : [[scope_i, key] for scope_i, key in self.memo_pending.items()],
+                 "memo"         : [[key, val] for key, val in interp.memo.items()],
+                 "stats"        : interp.stats,
+                 "elapsed"      : self.elapsed}
+
+        with open(path + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(path + ".tmp", path)
+
+    # Restore execution state loaded from a checkpoint
+    def restore(self, state):
+        nodes = self.interp.program.nodes
+        self.to_exec      = [nodes[n] for n in state["to_exec"]]
+        self.node_values  = {int(i): val for i, val in state["node_values"].items()}
+        self.var_values   = state["var_values"]
+        self.scope_map    = state["scope_map"]
+        self.jump_node    = state["jump_node"]
+        self.memo_pending = {scope_i: freeze(key) for scope_i, key in state["memo_pending"]}
+        self.elapsed      = state["elapsed"]
+        self.interp.memo  = OrderedDict((freeze(key), val) for key, val in state["memo"])
+        self.interp.stats = state["stats"]
+
+    # Approximate the memory held by the program's values
+    # Yields (Bytes, Values Visited); lists shared between values are counted once
+    def held_memory(self):
+        size  = 0
+        count = 0
+        seen  = set()
+        stack = list(self.var_values.values()) + list(self.node_values.values()) + list(self.interp.memo.values())
+        while stack:
+            val = stack.pop()
+            count += 1
+            if isinstance(val, list):
+                if id(val) in seen:
+                    continue
+                seen.add(id(val))
+                stack.extend(val)
+            size += sys.getsizeof(val)
+        return size, count
+
+    # Check a list of `length` values that arithmatic is about to make against the limits
+    # Adding lists can double their size every step, so this can't wait for the sampled checks in `run`
+    # The new list is charged to the memory budget (one slot per value) on top of the last measurement
+    def check_new_list(self, lptr, length):
+        interp = self.interp
+        if self.max_list_len and length > self.max_list_len:
+            interp._limit(lptr, "List length limit of {} exceeded".format(self.max_list_len))
+
+        if self.timeout and time.monotonic() > self.deadline:
+            interp._limit(lptr, "Timeout of {}s exceeded".format(self.timeout))
+
+        if self.max_memory:
+            budget = self.max_memory * 1024 * 1024
+            size   = sys.getsizeof([]) + 8 * length
+            self.allocated += size
+
+            # The estimate only grows, so measure again before deciding the budget is spent
+            if self.held + self.allocated > budget:
+                self.held, _   = self.held_memory()
+                self.allocated = size
+                if self.held + self.allocated > budget:
+                    interp._limit(lptr, "Memory limit of {}MiB exceeded".format(self.max_memory))
+
+    # Execute up to `steps` nodes (or until completion when None)
+    # Returns True once the program has run to completion
+    def run(self, steps = None):
+        interp = self.interp
+        prog   = interp.program
+        nget   = prog.node
+        stats  = interp.stats
+        memo   = interp.memo
+
+        scope_map    = self.scope_map
+        node_values  = self.node_values
+        var_values   = self.var_values
+        to_exec      = self.to_exec
+        jump_node    = self.jump_node
+        memo_size    = self.memo_size
+        memo_starts  = self.memo_starts
+        memo_pending = self.memo_pending
+
+        # Execution limits - zero means unlimited
+        # Time and memory are only checked every `check_every` steps to keep the loop cheap,
+        # and whenever arithmatic makes a list (see check_new_list)
+        max_steps    = int(interp._opt("max-steps", 0))
+        max_list_len = int(interp._opt("max-list-len", 0))
+        max_memory   = int(interp._opt("max-memory", 0))    # MiB held by program values
+        timeout      = float(interp._opt("timeout", 0))     # Wall clock seconds
+        started      = time.monotonic()
+        deadline     = started + timeout - self.elapsed
+        check_every  = 1024
+
+        self.max_list_len = max_list_len
+        self.max_memory   = max_memory
+        self.timeout      = timeout
+        self.deadline     = deadline
+
+        # Measuring memory visits every value, so it is done at most once per step per value held
+        memory_due   = 0
+
+        # Continue executing nodes while any are left, up to the step budget of this slice
+        ran = 0
+        while to_exec and (steps is None or ran < steps):
             node = to_exec.pop(0)
+            ran += 1
+
+            if max_steps and stats["steps"] >= max_steps:
+                interp._limit(node.lptr, "Step limit of {} exceeded".format(max_steps))
+            stats["steps"] += 1
+
+            if stats["steps"] % check_every == 0:
+                if timeout and time.monotonic() > deadline:
+                    interp._limit(node.lptr, "Timeout of {}s exceeded".format(timeout))
+
+                if max_memory and stats["steps"] >= memory_due:
+                    self.held, visited = self.held_memory()
+                    self.allocated = 0
+                    if self.held > max_memory * 1024 * 1024:
+                        interp._limit(node.lptr, "Memory limit of {}MiB exceeded".format(max_memory))
+                    memory_due = stats["steps"] + visited
 
             # If jump condition: skip until met
             if jump_node is not None:
@@ -552,20 +822,42 @@ class Interpreter:
                 else:
                     jump_node = None
 
+            # On entering pure scopes, serve the scope value from the memo table if possible
+            if node.i in memo_starts:
+                hit = False
+                for scope, length, read in memo_starts[node.i]:
+                    if not all(name in var_values for name in read):
+                        break
+
+                    key = (scope.i, tuple(freeze(var_values[name]) for name in read))
+                    if key in memo:
+                        memo.move_to_end(key)
+                        stats["memo hits"] += 1
+                        node_values[scope.i] = memo[key]
+                        del to_exec[:length - 1]
+                        hit = True
+                        break
+
+                    stats["memo misses"] += 1
+                    memo_pending[scope.i] = key
+
+                if hit:
+                    continue
+
             # VALUE nodes assume the values of their contents
             if node.nt == NodeType.VALUE:
                 if node.val.tt == TokenType.GNAME:
                     if node.val.val in var_values:
                         node_values[node.i] = var_values[node.val.val]
                     else:
-                        self._err(node.lptr, "Undefined global name {}".format(node.val.val))
+                        interp._err(node.lptr, "Undefined global name {}".format(node.val.val))
                         terminate()
 
                 elif node.val.tt == TokenType.LNAME:
                     if node.val.val in var_values:
                         node_values[node.i] = var_values[node.val.val]
                     else:
-                        self._err(node.lptr, "Undefined local name {}".format(node.val.val))
+                        interp._err(node.lptr, "Undefined local name {}".format(node.val.val))
                         terminate()
 
                 elif node.val.tt == TokenType.NUMBER:
@@ -611,7 +903,7 @@ class Interpreter:
                     ptr = 0
                     while len(outqueue) > 1:
                         if ptr == len(outqueue):
-                            self._err(node.lptr, "Malformed Arithmatic")
+                            interp._err(node.lptr, "Malformed Arithmatic")
                             terminate()
 
                         # We shift past values to find operators
@@ -621,7 +913,7 @@ class Interpreter:
 
                         # Can't evaluate an operator with less than two operands
                         if ptr < 2:
-                            self._err(node.lptr, "Malformed Arithmatic")
+                            interp._err(node.lptr, "Malformed Arithmatic")
                             terminate()
 
                         # Pull out the operator and two operands
@@ -631,6 +923,8 @@ class Interpreter:
 
                         result = None
                         if op == TokenType.PLUS:
+                            if isinstance(left, list) and isinstance(right, list):
+                                self.check_new_list(node.lptr, len(left) + len(right))
                             result = left + right
                         elif op == TokenType.MINUS:
                             result = left - right
@@ -675,7 +969,7 @@ class Interpreter:
                     node_values[node.i] = var_values[node.val.val]
 
                 else:
-                    self._err(node.lptr, "{} is not an in-scope local variable.".format(node.val.val))
+                    interp._err(node.lptr, "{} is not an in-scope local variable.".format(node.val.val))
                     terminate()
 
             # Scopes propogate the Return value upwards
@@ -687,6 +981,12 @@ class Interpreter:
                         del var_values[var]
                     del scope_map[node.scope_sig]
 
+                # Record pure scope values, evicting the least recently used
+                if node.i in memo_pending:
+                    memo[memo_pending.pop(node.i)] = node_values[node.i]
+                    if len(memo) > memo_size:
+                        memo.popitem(last = False)
+
             # If the predicate value matches a test, it blocks until a specified node
             elif node.nt == NodeType.PREDICATE:
                 result = node.val[0](node_values[node.children[0]])
@@ -710,11 +1010,14 @@ class Interpreter:
                     else:
                         node_values[node.i] = [node_values[node.children[1]]]
 
-                    child_indexes = [c.i for c in node.rec_list(i.program) if c.i != node.i]
+                    if max_list_len and len(node_values[node.i]) > max_list_len:
+                        interp._limit(node.lptr, "Cycle list length limit of {} exceeded".format(max_list_len))
+
+                    child_indexes = [c.i for c in node.rec_list(prog) if c.i != node.i]
                     for ind in child_indexes:
                         if ind in node_values:
                             del node_values[ind]
-                    to_exec = node.rec_list(i.program) + to_exec
+                    to_exec = node.rec_list(prog) + to_exec
 
             elif node.nt == NodeType.CONDEX:
                 if node.i in node_values:
@@ -726,7 +1029,7 @@ class Interpreter:
                     if block.nt == NodeType.IF:
                         p = block.children[0]
                         if node_values[p]:
-                            to_exec = nget(block.children[1]).rec_list(i.program) + [node] + to_exec
+                            to_exec = nget(block.children[1]).rec_list(prog) + [node] + to_exec
                             node_values[node.i] = block.children[1]
                             break
 
@@ -736,28 +1039,389 @@ class Interpreter:
             elif node.nt == NodeType.ELSE:
                 node_values[node.i] = node_values[node.children[0]]
 
+        # Rebound locals are written back so the next slice continues from here
+        self.to_exec   = to_exec
+        self.jump_node = jump_node
+        self.elapsed  += time.monotonic() - started
+        return self.done()
+
+    # Conclude a completed execution, returning the final variable values
+    def finish(self):
+        interp = self.interp
+
         # Print globals on conclusion when --globals passed to program
-        if "globals" in self.args:
-            self._rule()
+        if "globals" in interp.args:
+            interp._rule()
+
+            for var in self.var_values:
+                print("{} : {}".format(var, self.var_values[var]))
+
+            interp._rule()
+
+        # Print execution statistics when --stats passed to program
+        if "stats" in interp.args:
+            interp._stats()
+
+        return self.var_values
+
+# Parser Expectation States
+INITIAL        = 10    # Expect the start of a line
+ASSIGN         = 11    # Expect an assignment colon
+PAREN_CONTENTS = 20    # Expect contents of ()
+SCOPE_RET      = 21    # Expect a scope return to follow @
+EXPR_VAL       = 100   # Expect a value in an expression
+EXPR_OP        = 101   # Expect an operation in an expression
+END            = 900   # Expect newline
+
+HALT           = 1000  # Added to a state by handlers to stop parsing the line
+
+# Build the parser dispatch table: (Expectation, TokenType) -> Interpreter handler
+# Each state has a fallback handler for tokens it does not expect
+def build_parse_table():
+    I = Interpreter
+    fallbacks = {INITIAL        : I._p_malformed_line,
+                 ASSIGN         : I._p_expected_assign,
+                 PAREN_CONTENTS : I._p_paren_expr,
+                 SCOPE_RET      : I._p_uncovered,
+                 EXPR_VAL       : I._p_uncovered,
+                 EXPR_OP        : I._p_uncovered,
+                 END            : I._p_beyond_eol}
+
+    handlers = {(INITIAL,        TokenType.GNAME)  : I._p_lvalue,
+                (INITIAL,        TokenType.LNAME)  : I._p_lvalue,
+                # A line may also start with ')' or ']', handled as in an expression
+                (INITIAL,        TokenType.RPAREN) : I._p_rparen,
+                (INITIAL,        TokenType.RBRACK) : I._p_rbrack,
+                (ASSIGN,         TokenType.COLON)  : I._p_assign,
+                (EXPR_VAL,       TokenType.QUOI)   : I._p_condex,
+                (EXPR_VAL,       TokenType.GNAME)  : I._p_value,
+                (EXPR_VAL,       TokenType.LNAME)  : I._p_value,
+                (EXPR_VAL,       TokenType.NUMBER) : I._p_value,
+                (EXPR_VAL,       TokenType.LPAREN) : I._p_lparen,
+                (EXPR_VAL,       TokenType.LBRACK) : I._p_cycle,
+                (EXPR_OP,        TokenType.PLUS)   : I._p_op,
+                (EXPR_OP,        TokenType.MINUS)  : I._p_op,
+                (EXPR_OP,        TokenType.LPAREN) : I._p_implied_colon,
+                (EXPR_OP,        TokenType.LBRACK) : I._p_implied_colon,
+                (EXPR_OP,        TokenType.RPAREN) : I._p_rparen,
+                (EXPR_OP,        TokenType.RBRACK) : I._p_rbrack,
+                (EXPR_OP,        TokenType.COLON)  : I._p_colon,
+                (EXPR_OP,        TokenType.QUOI)   : I._p_elif,
+                (EXPR_OP,        TokenType.SEMI)   : I._p_else,
+                (PAREN_CONTENTS, TokenType.AT)     : I._p_scope,
+                (SCOPE_RET,      TokenType.GNAME)  : I._p_scope_ret}
+
+    table = {}
+    for state, fallback in fallbacks.items():
+        for tt in TokenType:
+            table[state, tt] = handlers.get((state, tt), fallback)
+    return table
+
+PARSE_TABLE = build_parse_table()
+
+# Clean up program arguments: --Name=Value becomes name=Value
+def parse_args(argv):
+    args = []
+    for a in argv:
+        if a.startswith("--"):
+            name, eq, val = a[2:].partition("=")
+            args.append(name.lower() + eq + val)
+    return args
+
+# Get the value of an option from a cleaned up argument list
+def get_opt(args, name, default):
+    for a in args:
+        if a.startswith(name + "="):
+            return a[len(name) + 1:]
+    return default
+
+
+# Server mode keeps a warm interpreter listening on a local socket
+# Requests and responses are single lines of JSON:
+#   -> {"source": "<program text>", "args": ["globals", "max-steps=1000"]}
+#   <- {"status": "ok" | "error", "output": "<printed text>", "globals": {...}, "stats": {...}}
+# Programs run in a pool of worker processes, each with an LRU cache of parsed programs
+
+DEFAULT_PORT    = 7314
+REQUEST_LIMIT   = 16 * 1024 * 1024  # Largest accepted request line in bytes
+
+# Limits the server enforces on every program: (Type, Default)
+# A client may ask for a tighter limit but never a looser one; zero lifts a limit
+SERVER_LIMITS = {"max-steps"  : (int,   10000000),
+                 "timeout"    : (float, 30),        # Wall clock seconds
+                 "max-memory" : (int,   256),       # MiB held by program values
+                 "max-output" : (int,   1024 * 1024)}  # Characters of captured output
+
+# Mapping: Program Source -> (Program, Lines, Parser Output)
+program_cache      = OrderedDict()
+program_cache_size = 64
+
+def init_worker(cache_size):
+    global program_cache_size
+    program_cache_size = cache_size
+
+class OutputLimitExceeded(Exception):
+    pass
+
+# Captured output of a program, limited to `limit` characters (zero for no limit)
+class CappedOutput(io.StringIO):
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+
+    def write(self, s):
+        if self.limit and self.tell() + len(s) > self.limit:
+            # Lift the limit so the error explaining it can still be written
+            self.limit = 0
+            raise OutputLimitExceeded()
+        return super().write(s)
+
+# Parse (or fetch from the cache) and execute a program, capturing its output
+def run_source(source, args):
+    i = Interpreter(args)
+    max_output = int(i._opt("max-output", 0))
+    out = CappedOutput(max_output)
+    status = "ok"
+    var_values = {}
+
+    with contextlib.redirect_stdout(out):
+        try:
+            if source in program_cache:
+                program_cache.move_to_end(source)
+                i.program, i.lines, parse_out = program_cache[source]
+                out.write(parse_out)
+            else:
+                for line in io.StringIO(source):
+                    i.feed(line)
+                program_cache[source] = (i.program, i.lines, out.getvalue())
+                if len(program_cache) > program_cache_size:
+                    program_cache.popitem(last = False)
+
+            if "ast" in i.args:
+                i._rule()
+                print(i.program)
+                i._rule()
+
+            var_values = i.execute()
+
+        # terminate() exits - here it just ends the request
+        except SystemExit:
+            status = "error"
+
+        except OutputLimitExceeded:
+            print("\nError: Output limit of {} characters exceeded".format(max_output))
+            print("Interpreter Terminated")
+            status = "error"
+
+        # Anything else is an interpreter bug or a bad option; report it rather than lose the reply
+        except Exception as e:
+            print("Error: {}: {}".format(type(e).__name__, e))
+            print("Interpreter Terminated")
+            status = "error"
+
+    return {"status"  : status,
+            "output"  : out.getvalue(),
+            "globals" : var_values,
+            "stats"   : i.stats}
+
+# Server holds the listening socket, the worker pool and the limits it enforces
+class Server:
+    def __init__(self, args):
+        self.workers    = int(get_opt(args, "workers", os.cpu_count() or 1))
+        self.cache_size = int(get_opt(args, "cache-size", 64))
+        self.path       = get_opt(args, "socket", None)
+        self.port       = int(get_opt(args, "port", DEFAULT_PORT))
+
+        # Mapping: Option Name -> Server Limit, from --<name>=N or SERVER_LIMITS
+        self.limits = {name: conv(get_opt(args, name, default))
+                       for name, (conv, default) in SERVER_LIMITS.items()}
+
+        self.pool = self.new_pool()
+
+    def new_pool(self):
+        return ProcessPoolExecutor(self.workers, initializer = init_worker, initargs = (self.cache_size,))
+
+    # Shut a pool down without waiting for the programs it is running
+    def stop_pool(self, pool):
+        # ProcessPoolExecutor has no public way to stop busy workers before Python 3.14
+        # Killing them first means waiting on the shutdown below returns promptly
+        for process in list((pool._processes or {}).values()):
+            process.kill()
+        pool.shutdown(wait = True, cancel_futures = True)
+
+    # Merge a client's options with the server's limits
+    # Raises ValueError for a limit that is not a number
+    def limit_args(self, args):
+        merged = [a for a in args if a.partition("=")[0] not in self.limits]
+        for name, cap in self.limits.items():
+            conv  = SERVER_LIMITS[name][0]
+            asked = conv(get_opt(args, name, 0))
+            if asked < 0:
+                raise ValueError("{} cannot be negative".format(name))
+
+            if cap and (not asked or asked > cap):
+                asked = cap
+            if asked:
+                merged.append("{}={}".format(name, asked))
+        return merged
+
+    # Run a program in the pool, replacing the pool if a worker has died
+    async def run(self, source, args):
+        pool = self.pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, run_source, source, args)
+        except BrokenProcessPool:
+            # Requests running at the same time all fail - only the first replaces the pool
+            if self.pool is pool:
+                self.stop_pool(pool)
+                self.pool = self.new_pool()
+            return {"status": "error", "output": "Error: worker process died while running the program\n"}
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                # readline raises ValueError for requests over REQUEST_LIMIT
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    response = {"status": "error", "output": "Bad request: larger than {} bytes\n".format(REQUEST_LIMIT)}
+                    writer.write(json.dumps(response).encode() + b"\n")
+                    await writer.drain()
+                    break
+
+                if not line:
+                    break
+
+                response = None
+                try:
+                    request = json.loads(line)
+                    source  = request["source"]
+                    args    = request.get("args", [])
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    response = {"status": "error", "output": "Bad request: {}\n".format(e)}
+                else:
+                    if not isinstance(source, str):
+                        response = {"status": "error", "output": "Bad request: source must be a string\n"}
+                    elif not isinstance(args, list) or not all(isinstance(a, str) for a in args):
+                        response = {"status": "error", "output": "Bad request: args must be a list of strings\n"}
+
+                if response is None:
+                    try:
+                        args = self.limit_args(parse_args("--" + a for a in args))
+                    except ValueError as e:
+                        response = {"status": "error", "output": "Bad request: {}\n".format(e)}
+                    else:
+                        response = await self.run(source, args)
+
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
 
-            for var in var_values:
-                print("{} : {}".format(var, var_values[var]))
+        # Cancelled when the server shuts down mid-request
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
 
-            self._rule()
+    async def serve(self):
+        if self.path is not None:
+            server = await asyncio.start_unix_server(self.handle_client, self.path, limit = REQUEST_LIMIT)
+            print("Serving on {}".format(self.path))
+        else:
+            server = await asyncio.start_server(self.handle_client, "127.0.0.1", self.port, limit = REQUEST_LIMIT)
+            print("Serving on 127.0.0.1:{}".format(self.port))
+
+        # SIGTERM stops serving, and the workers are stopped even if they are busy
+        serving = asyncio.ensure_future(server.serve_forever())
+        with contextlib.suppress(NotImplementedError):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+
+        try:
+            async with server:
+                await serving
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.stop_pool(self.pool)
+            if self.path is not None and os.path.exists(self.path):
+                os.remove(self.path)
+
+# Send a program from stdin to a server, printing what it printed
+# Options other than --socket and --port are passed on to the server
+def client(args):
+    path = get_opt(args, "socket", None)
+    request = {"source" : sys.stdin.read(),
+               "args"   : [a for a in args if a.partition("=")[0] not in {"socket", "port"}]}
+
+    try:
+        if path is not None:
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn.connect(path)
+        else:
+            conn = socket.create_connection(("127.0.0.1", int(get_opt(args, "port", DEFAULT_PORT))))
+
+        with conn, conn.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            reply = stream.readline()
+    except OSError as e:
+        print("Error: could not reach server: {}".format(e))
+        sys.exit(1)
+
+    try:
+        response = json.loads(reply)
+        output   = response["output"]
+        status   = response["status"]
+    except (ValueError, KeyError, TypeError):
+        print("Error: no valid reply from server")
+        sys.exit(1)
+
+    sys.stdout.write(output)
+    if status != "ok":
+        sys.exit(1)
 
 if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+
+    # `jpi.py serve` and `jpi.py client` run the server mode
+    if sys.argv[1:2] == ["serve"]:
+        try:
+            asyncio.run(Server(args).serve())
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    if sys.argv[1:2] == ["client"]:
+        client(args)
+        sys.exit(0)
+
     # Create the Interpreter, passing in the arguments
-    i = Interpreter([a[2:].lower() for a in sys.argv[1:] if a.startswith("--")])
+    i = Interpreter(args)
+
+    # Continue a suspended program if requested by --resume
+    resume = i._opt("resume", None)
+    if resume is not None:
+        ex = i.resume(resume)
+
+    else:
+        # Tokenise and Parse lines one at a time
+        for line in sys.stdin:
+            i.feed(line)
 
-    # Tokenise and Parse lines one at a time
-    for line in sys.stdin:
-        i.feed(line)
+        # Print semi-AST if requested by --ast
+        if "ast" in i.args:
+            i._rule()
+            print(i.program)
+            i._rule()
 
-    # Print semi-AST if requested by --ast
-    if "ast" in i.args:
-        i._rule()
-        print(i.program)
-        i._rule()
+        ex = Execution(i)
 
     # Execute program
-    i.execute()
+    # With --slice, suspend after that many steps by writing a --checkpoint file
+    slice_steps = int(i._opt("slice", 0)) or None
+    if ex.run(slice_steps):
+        ex.finish()
+    else:
+        checkpoint = i._opt("checkpoint", "jpi.ckpt")
+        ex.save(checkpoint)
+        sys.stderr.write("Suspended after {} steps: resume with --resume={}\n".format(i.stats["steps"], checkpoint))
+        sys.exit(2)
@@ -19,3 +19,35 @@ cat ./tests/if.pi | python3 jpi.py
 echo "\n\nIf / Elif / Else: [1, 2, 3]"
 echo "-----------------"
 cat ./tests/condex.pi | python3 jpi.py
+
+echo "\n\nMemoised Scope: [[3, 4, 5], [3, 4, 5], [3, 4, 5], [3, 4, 5]]"
+echo "-----------------"
+cat ./tests/memo.pi | python3 jpi.py
+
+echo "\n\nStep Limit: Error after 1000 steps"
+echo "-----------------"
+cat ./tests/forever.pi | python3 jpi.py --max-steps=1000
+
+echo "\n\nSuspend / Resume: [1, 1, 2, 3, 5, 8, 13, 21, 34, 55]"
+echo "-----------------"
+cat ./tests/fib.pi | python3 jpi.py --slice=100 --checkpoint=./fib.ckpt 2> /dev/null
+python3 jpi.py --resume=./fib.ckpt
+rm -f ./fib.ckpt
+
+echo "\n\nServer: [1, 1, 2, 3, 5, 8, 13, 21, 34, 55] and globals, an error reply, then the server step cap of 1000"
+echo "-----------------"
+SOCK=./jpi_test.sock
+rm -f $SOCK
+python3 jpi.py serve --socket=$SOCK --workers=1 --max-steps=1000 > /dev/null &
+SERVER=$!
+while [ ! -S $SOCK ]; do sleep 0.1; done
+cat ./tests/fib.pi | python3 jpi.py client --socket=$SOCK --globals
+echo "'c' : 'c' + 1" | python3 jpi.py client --socket=$SOCK || echo "Client exited with error"
+cat ./tests/forever.pi | python3 jpi.py client --socket=$SOCK --max-steps=0 | grep "limit"
+kill $SERVER
+wait $SERVER 2> /dev/null
+rm -f $SOCK
+
+echo "\n\nMemory Limit: Error on Line 11 when doubling a list"
+echo "-----------------"
+cat ./tests/double.pi | python3 jpi.py --max-memory=100